@@ -26,3 +26,26 @@ if __name__ == '__main__':
         print('Add:     ', SW.add(i))
         print('Periods: ', SW.get_current_periods())
         print('Window:  ', SW.get_current_window())
+
+    # ------------------------------------------------------------------------------
+    # Example: bulk / backfill
+    # ------------------------------------------------------------------------------
+    SW = SlidingTimeWindows(window_duration=6,
+                            window_period=3)
+    now = time.time()
+    print('\n')
+    print('Add many:', SW.add_many(range(6),
+                                   timestamps=[now - 6, now - 5, now - 2, now - 1, now, now]))
+    print('Periods: ', SW.get_current_periods())
+
+    # ------------------------------------------------------------------------------
+    # Example: event time
+    # ------------------------------------------------------------------------------
+    SW = SlidingTimeWindows(window_duration=6,
+                            window_period=3)
+    now = time.time()
+    print('\n')
+    print('Add late:     ', SW.add('late', timestamp=now - 2))       # previous period
+    print('Add too late: ', SW.add('too late', timestamp=now - 10))  # older than the window, dropped
+    print('Add ahead:    ', SW.add('ahead', timestamp=now + 1))      # later than the current period, added to it
+    print('Periods: ', SW.get_current_periods())
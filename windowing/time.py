@@ -1,8 +1,91 @@
 import time
-from datetime import datetime
 import math
-import copy
-from typing import List, Tuple, Any
+from collections import deque
+from itertools import chain, groupby, islice
+from operator import itemgetter
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+
+class _WindowBoundary(Sequence):
+    '''Start and end time of a window, formatted only when they are accessed.
+    It unpacks, indexes and compares like the (start, end) tuple of strings,
+    but it is not a tuple, call tuple() on it to get one.
+    '''
+    __slots__ = ('_start_ts', '_end_ts')
+
+    def __init__(self,
+                 start_ts: float,
+                 end_ts: float):
+        self._start_ts = start_ts
+        self._end_ts = end_ts
+
+    @staticmethod
+    def _format(ts: float) -> str:
+        # Same output as datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S.%f')
+        frac, seconds = math.modf(ts)
+        microseconds = round(frac * 1e6)
+        if microseconds >= 1000000:
+            seconds += 1
+            microseconds -= 1000000
+        elif microseconds < 0:
+            seconds -= 1
+            microseconds += 1000000
+        return f'{time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds))}.{microseconds:06d}'
+
+    def __iter__(self):
+        yield self._format(self._start_ts)
+        yield self._format(self._end_ts)
+
+    def __len__(self) -> int:
+        return 2
+
+    def __getitem__(self, index):
+        return tuple(self)[index]
+
+    def __eq__(self, other) -> bool:
+        return tuple(self) == other
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return repr(tuple(self))
+
+
+class _WindowView(Sequence):
+    '''Read-only sequence of the values in a window, backed by the period lists.
+    The values are not copied, call list() on the view to get an independent copy.
+    '''
+    __slots__ = ('_periods',)
+
+    def __init__(self, periods: List[List]):
+        self._periods = periods
+
+    def __iter__(self):
+        return chain.from_iterable(self._periods)
+
+    def __len__(self) -> int:
+        return sum(map(len, self._periods))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if index >= 0:
+            for period in self._periods:
+                if index < len(period):
+                    return period[index]
+                index -= len(period)
+        raise IndexError('window index out of range')
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, _WindowView):
+            other = list(other)
+        return list(self) == other
+
+    def __repr__(self) -> str:
+        return repr(list(self))
 
 
 class SlidingTimeWindows:
@@ -59,6 +142,10 @@ class SlidingTimeWindows:
     This class implemented by using the concepts in the link below:
     https://beam.apache.org/documentation/programming-guide/#sliding-time-windows
     '''
+    __slots__ = ('_window_duration', '_window_period', '_force_start',
+                 '_no_of_retain_periods', '_period_ns', '_window_span_ns',
+                 '_window_periods', '_period', 'is_started',
+                 '_start_time_ns', '_start_period_ns', '_wall_clock_offset_ns')
 
     def __init__(self,
                  window_duration: float,
@@ -75,71 +162,79 @@ class SlidingTimeWindows:
         self._force_start = force_start
 
         self._no_of_retain_periods = int(self._window_duration / self._window_period)
+        # Periods are tracked in integer nanoseconds
+        self._period_ns = int(round(self._window_period * 1e9))
+        self._window_span_ns = self._period_ns * self._no_of_retain_periods
 
-        self._window_periods = self._no_of_retain_periods * [[]]
-        self._period = list()
+        self._init_periods()
         self.is_started = False
 
         if prompt_start:
             self.start()
 
-    def _check_start(class_method):
-        def method_wrapper(self, *arg, **kwarg):
-            if self.is_started:
-                return class_method(self, *arg, **kwarg)
-            elif (not self.is_started) and self._force_start:
-                self.start()
-                return class_method(self, *arg, **kwarg)
-            else:
-                raise RuntimeError('self.start() need to be called before proceeding the operation.')
-        return method_wrapper
-
-    def _add_new_window_period(self,
-                               time_diff: float,
-                               value: Any = None) -> Tuple[List[List], list]:
-
-        tmp_window_periods = copy.deepcopy(self._window_periods)
-        tmp_period = copy.deepcopy(self._period)
-
-        # Add current window period
-        tmp_window_periods.append(tmp_period)
-        tmp_window_periods.pop(0)
-
-        if time_diff >= (2 * self._window_period):
-            # Update blank period
-            num_blank_period = time_diff / self._window_period
-            floor_num_blank_period = int(math.floor(num_blank_period))
-            for _ in range(floor_num_blank_period - 1):
-                tmp_window_periods.append(list())
-                tmp_window_periods.pop(0)
-        else:  # time_diff < (2 * self._window_period)
-            pass
+    def _init_periods(self):
+        self._window_periods = deque([list() for _ in range(self._no_of_retain_periods)],
+                                     maxlen=self._no_of_retain_periods)
+        self._period = list()
 
-        # Add new value
-        if value is not None:
-            tmp_period = [value]
+    def _lazy_start(self):
+        if self._force_start:
+            self.start()
         else:
-            tmp_period = list()
+            raise RuntimeError('self.start() need to be called before proceeding the operation.')
+
+    def _peek(self, now_ns: int) -> Tuple[int, int]:
+        # Number of periods passed since the last update and the start of the current period,
+        # add() applies them to the window, the read methods only view them
+        no_of_passed_periods = (now_ns - self._start_period_ns) // self._period_ns
+        start_period_ns = self._start_period_ns + self._period_ns * no_of_passed_periods
+        return no_of_passed_periods, start_period_ns
+
+    def _advance(self,
+                 no_of_passed_periods: int,
+                 value: Any = None,
+                 mutate: bool = True) -> Optional[List[List]]:
+
+        if not mutate:
+            # Shifted view of the periods, the window itself is left untouched
+            if no_of_passed_periods > self._no_of_retain_periods:
+                return [list() for _ in range(self._no_of_retain_periods)]
+            window_periods = list(islice(self._window_periods, no_of_passed_periods, None))
+            if no_of_passed_periods > 0:
+                window_periods.append(self._period)
+                window_periods.extend(list() for _ in range(no_of_passed_periods - 1))
+            return window_periods
+
+        if no_of_passed_periods > self._no_of_retain_periods:
+            # Even the current period is out of the window, every period is blank
+            self._window_periods.extend(list() for _ in range(self._no_of_retain_periods))
+            self._period = list()
+        elif no_of_passed_periods > 0:
+            # Move current period into the window, the rest of the passed periods are blank
+            # (the oldest periods are evicted by the deque itself)
+            self._window_periods.append(self._period)
+            self._window_periods.extend(list() for _ in range(no_of_passed_periods - 1))
+            self._period = list()
 
-        return tmp_window_periods, tmp_period
+        # Add new value
+        if value is not None:
+            self._period.append(value)
 
-    def _calculate_window_boundary(self, start_period_time):
-        format = '%Y-%m-%d %H:%M:%S.%f'
+    def _to_wall_time(self, monotonic_ns: int) -> float:
+        return (monotonic_ns + self._wall_clock_offset_ns) / 1e9
 
-        period_start_ts = start_period_time - (self._window_period * self._no_of_retain_periods)
-        period_start = datetime.fromtimestamp(period_start_ts).strftime(format)
+    def _calculate_window_boundary(self, start_period_ns: int) -> _WindowBoundary:
+        return _WindowBoundary(self._to_wall_time(start_period_ns - self._window_span_ns),
+                               self._to_wall_time(start_period_ns))
 
-        period_end_ts = start_period_time
-        period_end = datetime.fromtimestamp(period_end_ts).strftime(format)
-        window_boundary = (period_start, period_end)
-        return window_boundary
+    def _get_window(self, no_of_passed_periods: int) -> _WindowView:
+        return _WindowView(self._advance(no_of_passed_periods, mutate=False))
 
     def _add(self,
-             value: Any = None) -> Tuple[List[List], list]:
-        current_time = time.time()
-        time_diff = current_time - self.__start_period_time
+             value: Any = None) -> Tuple[bool, int]:
+        no_of_passed_periods, start_period_ns = self._peek(time.monotonic_ns())
 
-        if time_diff < self._window_period:
+        if no_of_passed_periods == 0:
             add_to_new_window = False
             if value is not None:
                 if len(self._period) == 0:
@@ -147,64 +242,159 @@ class SlidingTimeWindows:
                 self._period.append(value)
         else:
             add_to_new_window = True
-            self._window_periods, self._period = self._add_new_window_period(time_diff=time_diff,
-                                                                             value=value)
-            no_of_passed_periods = time_diff // self._window_period
-            self.__start_period_time += (self._window_period * no_of_passed_periods)
-
-        current_window_boundary = self._calculate_window_boundary(self.__start_period_time)
-        current_window = sum(self._window_periods, [])
-        return add_to_new_window, self._window_periods, current_window, current_window_boundary
+            self._advance(no_of_passed_periods, value=value)
+            self._start_period_ns = start_period_ns
+
+        return add_to_new_window, self._start_period_ns
+
+    def _get_period_offset(self,
+                           timestamp: float,
+                           clock_offset_ns: int) -> int:
+        # 0 is the current period, -1 the latest completed period and so on.
+        # clock_offset_ns is (monotonic - wall clock) read at call time, so the event keeps its age
+        # even if the wall clock was stepped after start()
+        event_ns = int(round(timestamp * 1e9)) + clock_offset_ns
+        # A timestamp ahead of the current period (e.g. producer clock skew) falls into the current period
+        return min((event_ns - self._start_period_ns) // self._period_ns, 0)
+
+    def _get_period(self, period_offset: int) -> list:
+        return self._period if period_offset == 0 else self._window_periods[period_offset]
+
+    def _add_to_period(self,
+                       period_offset: int,
+                       values: Iterable[Any]) -> bool:
+        if period_offset < -self._no_of_retain_periods:
+            # The period is already out of the window
+            return False
+        period = self._get_period(period_offset)
+        was_empty = len(period) == 0
+        period.extend(values)
+        return was_empty and len(period) > 0
 
     def start(self):
         '''Start windowing
         '''
         # Initialize Time
+        # (periods are measured on the monotonic clock, wall clock is only used for reporting)
         self.is_started = True
-        self.__start_time = time.time()
-        self.__start_period_time = self.__start_time
+        self._start_time_ns = time.time_ns()
+        self._start_period_ns = time.monotonic_ns()
+        self._wall_clock_offset_ns = self._start_time_ns - self._start_period_ns
 
-    @_check_start
     def add(self,
-            value: Any = None) -> Tuple[List[List], list]:
+            value: Any = None,
+            timestamp: Optional[float] = None) -> Tuple[bool, Sequence, Sequence[str]]:
         '''Returns Tuple which contains "new_window_status" and "window" respectively
 
         :param value: Value to be added to the window.
         :type value: Any
+        :param timestamp: Event time of the value (second since the epoch, as from time.time()),
+                          if None, the value is added to the current period.
+        :type timestamp: Optional[float]
 
-        :rtype: Tuple[List[List], list]
+        :rtype: Tuple[bool, Sequence, Sequence[str]]
         :return: Tuple which contains "add_to_new_window", "current_window" and "current_window_boundary" respectively
 
         .. notes::
         "add_to_new_window" is "True" when the value is added to newly created window at first time.
-        "current_window_boundary" consist of 2 members which are the start and end time of the current window respectively
+        "current_window" is a read-only view of the values, call list() on it to get a copy.
+        "current_window_boundary" consist of 2 members which are the start and end time of the current window respectively,
+        it is a tuple-like sequence formatted on access, call tuple() on it where a real tuple is needed (e.g. json.dumps).
+        A late value is added to the period its timestamp falls into, it is dropped if that period is older than the window.
+        A timestamp later than the current period is added to the current period.
+        '''
+        if not self.is_started:
+            self._lazy_start()
+        if timestamp is None:
+            add_to_new_window, start_period_ns = self._add(value=value)
+        else:
+            _, start_period_ns = self._add(value=None)
+            clock_offset_ns = time.monotonic_ns() - time.time_ns()
+            add_to_new_window = (value is not None
+                                 and self._add_to_period(self._get_period_offset(timestamp, clock_offset_ns), (value,)))
+        current_window = self._get_window(0)
+        current_window_boundary = self._calculate_window_boundary(start_period_ns)
+        return add_to_new_window, current_window, current_window_boundary
+
+    def add_many(self,
+                 values: Iterable[Any],
+                 timestamps: Optional[Iterable[float]] = None) -> Tuple[bool, Sequence, Sequence[str]]:
+        '''Adds several values at once, returns the same Tuple as .add()
+
+        :param values: Values to be added to the window.
+        :type values: Iterable[Any]
+        :param timestamps: Event time of each value (second since the epoch, as from time.time()),
+                           if None, all values are added to the current period.
+        :type timestamps: Optional[Iterable[float]]
+
+        :raises ValueError: If values and timestamps have different lengths.
+
+        :rtype: Tuple[bool, Sequence, Sequence[str]]
+        :return: Tuple which contains "add_to_new_window", "current_window" and "current_window_boundary" respectively
+
+        .. notes::
+        Each value is added to the period its timestamp falls into, values older than the window are dropped
+        and values later than the current period are added to the current period.
+        Consecutive values of the same period are added together, so sorted timestamps are the cheapest to add.
+        None values are skipped as in .add(), "add_to_new_window" is "True" when any value is the first one of its period.
         '''
-        add_to_new_window, _, current_window, current_window_boundary = self._add(value=value)
+        if not self.is_started:
+            self._lazy_start()
+        if timestamps is not None:
+            values = list(values)
+            timestamps = list(timestamps)
+            if len(values) != len(timestamps):
+                raise ValueError('values and timestamps must have the same length')
+        _, start_period_ns = self._add(value=None)
+
+        # Work out the period of every value before any of them is added
+        if timestamps is None:
+            groups = [(0, [value for value in values if value is not None])]
+        else:
+            clock_offset_ns = time.monotonic_ns() - time.time_ns()
+            period_offsets = [self._get_period_offset(timestamp, clock_offset_ns) for timestamp in timestamps]
+            groups = [(period_offset, [value for _, value in group if value is not None])
+                      for period_offset, group in groupby(zip(period_offsets, values), key=itemgetter(0))]
+
+        add_to_new_window = False
+        for period_offset, group in groups:
+            if self._add_to_period(period_offset, group):
+                add_to_new_window = True
+
+        current_window = self._get_window(0)
+        current_window_boundary = self._calculate_window_boundary(start_period_ns)
         return add_to_new_window, current_window, current_window_boundary
 
-    @_check_start
-    def get_current_periods(self) -> Tuple[List[List], Tuple[datetime, datetime]]:
+    def get_current_periods(self) -> Tuple[List[List], Sequence[str]]:
         '''Returns current window periods.
 
-        :rtype: Tuple[List[List], Tuple[datetime, datetime]]
+        :rtype: Tuple[List[List], Sequence[str]]
         :return: current_window_periods, current_window_boundary
 
         .. notes::
-        "current_window_boundary" consist of 2 members which are the start and end time of the current window respectively
+        "current_window_boundary" consist of 2 members which are the start and end time of the current window respectively,
+        it is a tuple-like sequence formatted on access, call tuple() on it where a real tuple is needed (e.g. json.dumps).
         '''
-
-        _, current_window_periods, _, current_window_boundary = self._add(value=None)
+        if not self.is_started:
+            self._lazy_start()
+        no_of_passed_periods, start_period_ns = self._peek(time.monotonic_ns())
+        current_window_periods = self._advance(no_of_passed_periods, mutate=False)
+        current_window_boundary = self._calculate_window_boundary(start_period_ns)
         return current_window_periods, current_window_boundary
 
-    @_check_start
-    def get_current_window(self) -> list:
+    def get_current_window(self) -> Sequence:
         '''Returns current window
 
-        :rtype: list
+        :rtype: Sequence
         :return: current_window
+
+        .. notes::
+        "current_window" is a read-only view of the values, call list() on it to get a copy.
         '''
-        current_window_periods, _ = self.get_current_periods()
-        current_window = sum(current_window_periods, [])
+        if not self.is_started:
+            self._lazy_start()
+        no_of_passed_periods, _ = self._peek(time.monotonic_ns())
+        current_window = self._get_window(no_of_passed_periods)
         return current_window
 
     def get_status(self) -> dict:
@@ -213,12 +403,59 @@ class SlidingTimeWindows:
         :rtype: dict
         :return: instance status
         '''
-        return {'start_time': self.__start_time,
-                'start_period_time': self.__start_period_time}
+        if not self.is_started:
+            self._lazy_start()
+        _, start_period_ns = self._peek(time.monotonic_ns())
+        return {'start_time': self._start_time_ns / 1e9,
+                'start_period_time': self._to_wall_time(start_period_ns)}
 
 
 class FixedTimeWindows(SlidingTimeWindows):
+    '''The class to represent a fixed time windows data structure.
+    It has the same interface as SlidingTimeWindows with window_period equal to window_duration,
+    the window is the last completed period so it is kept as a single list instead of a deque of periods.
+
+    :param window_duration: Window duration (second)
+    :type window_duration: float
+
+    :rtype: FixedTimeWindows
+    :return: FixedTimeWindows instance
+
+    .. seealso::
+    https://beam.apache.org/documentation/programming-guide/#fixed-time-windows
+    '''
+    __slots__ = ('_window',)
+
     def __init__(self,
                  window_duration: float):
         super().__init__(window_duration=window_duration,
                          window_period=window_duration)
+
+    def _init_periods(self):
+        self._window = list()
+        self._period = list()
+
+    def _advance(self,
+                 no_of_passed_periods: int,
+                 value: Any = None,
+                 mutate: bool = True) -> Optional[List[List]]:
+
+        if not mutate:
+            if no_of_passed_periods == 0:
+                return [self._window]
+            elif no_of_passed_periods == 1:
+                return [self._period]
+            return [list()]
+
+        if no_of_passed_periods == 1:
+            self._window = self._period
+            self._period = list()
+        elif no_of_passed_periods > 1:
+            self._window = list()
+            self._period = list()
+
+        if value is not None:
+            self._period.append(value)
+
+    def _get_period(self, period_offset: int) -> list:
+        return self._period if period_offset == 0 else self._window